@@ -1,5 +1,7 @@
 """stac_fastapi: sqlalchemy module."""
 
+import os
+
 from setuptools import find_namespace_packages, setup
 
 with open("README.md") as f:
@@ -15,17 +17,17 @@ install_requires = [
     "sqlakeyset",
     "geoalchemy2",
     "sqlalchemy==1.3.23",
-    "shapely",
+    "shapely>=2.0",
     "psycopg2-binary",
     "alembic",
     "fastapi-utils",
+    "orjson",
     "typing_inspect",
 ]
 
 extra_reqs = {
     "dev": [
         "httpx",  # for starlette's test client
-        "orjson",
         "pystac[validation]",
         "pytest",
         "pytest-cov",
@@ -38,6 +40,23 @@ extra_reqs = {
     "server": ["uvicorn[standard]==0.35.0"],
 }
 
+# Optionally compile the serializers, which run once per returned item, to a
+# C extension with mypyc. The pure python module is shipped alongside it.
+ext_modules = []
+if os.environ.get("STAC_FASTAPI_SQLALCHEMY_MYPYC"):
+    from mypyc.build import mypycify
+
+    # stac_fastapi is a namespace package shared with the stac-fastapi
+    # distributions, so mypy needs explicit package bases to resolve the
+    # module name of the serializers
+    ext_modules = mypycify(
+        [
+            "--explicit-package-bases",
+            "--ignore-missing-imports",
+            "stac_fastapi/sqlalchemy/serializers.py",
+        ]
+    )
+
 
 setup(
     name="stac-fastapi.sqlalchemy",
@@ -58,6 +77,8 @@ setup(
     url="https://github.com/stac-utils/stac-fastapi",
     license="MIT",
     packages=find_namespace_packages(exclude=["alembic", "tests", "scripts"]),
+    package_data={"stac_fastapi.sqlalchemy": ["py.typed"]},
+    ext_modules=ext_modules,
     zip_safe=False,
     install_requires=install_requires,
     tests_require=extra_reqs["dev"],
@@ -29,6 +29,10 @@ class SqlalchemySettings(ApiSettings):
     # Fields which are item properties but indexed as distinct fields in the database model
     indexed_fields: Set[str] = {"datetime"}
 
+    # Build response items read from the database without re-validating them
+    # against the STAC item model. Items are still validated when ingested.
+    skip_response_validation: bool = False
+
     @property
     def reader_connection_string(self):
         """Create reader psql connection string."""
@@ -1,13 +1,15 @@
 """Item crud client."""
+import itertools
 import json
 import logging
 import operator
 from datetime import datetime
-from typing import List, Optional, Set, Type, Union
+from typing import Iterator, List, Optional, Set, Type, Union
 from urllib.parse import unquote_plus, urlencode, urljoin
 
 import attr
 import geoalchemy2 as ga
+import orjson
 import sqlalchemy as sa
 import stac_pydantic
 from fastapi import HTTPException
@@ -16,6 +18,7 @@ from shapely.geometry import Polygon as ShapelyPolygon
 from shapely.geometry import shape
 from sqlakeyset import get_page
 from sqlalchemy import func
+from sqlalchemy.orm import Query
 from sqlalchemy.orm import Session as SqlSession
 from stac_fastapi.api.models import create_post_request_model
 from stac_fastapi.types.config import Settings
@@ -25,6 +28,7 @@ from stac_fastapi.types.search import BaseSearchPostRequest
 from stac_fastapi.types.stac import Collection, Collections, Item, ItemCollection
 from stac_pydantic.links import Relations
 from stac_pydantic.shared import MimeTypes
+from starlette.responses import StreamingResponse
 
 from stac_fastapi.sqlalchemy import serializers
 from stac_fastapi.sqlalchemy.extensions.query import Operator
@@ -36,6 +40,19 @@ logger = logging.getLogger(__name__)
 
 NumType = Union[float, int]
 
+# Values of the `f` query parameter for which item collections are streamed
+# one feature per record rather than returned as a FeatureCollection
+STREAMING_MEDIA_TYPES = {
+    "geojsonseq": "application/geo+json-seq",
+    "ndjson": "application/ndjson",
+}
+# Bytes each streamed record starts with. GeoJSON text sequences (RFC 8142)
+# open every record with an ASCII record separator, NDJSON records are only
+# newline terminated
+STREAM_RECORD_SEPARATORS = {"geojsonseq": b"\x1e", "ndjson": b""}
+# Number of rows fetched at a time from the cursor when streaming items
+STREAM_BATCH_SIZE = 200
+
 
 @attr.s
 class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
@@ -50,13 +67,8 @@ class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
     collection_serializer: Type[serializers.Serializer] = attr.ib(
         default=serializers.CollectionSerializer
     )
-<<<<<<< HEAD
-    #added attribute post_request_model to the class core crud client
-    post_request_model: type = attr.ib(factory=lambda: create_post_request_model([]))
-=======
     post_request_model: type = attr.ib(factory=lambda: create_post_request_model([]))
 
->>>>>>> tests/swagger_docs
     @staticmethod
     def _lookup_id(
         id: str, table: Type[database.BaseModel], session: SqlSession
@@ -67,6 +79,114 @@ class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
             raise NotFoundError(f"{table.__name__} {id} not found")
         return row
 
+    @staticmethod
+    def _dump_items(features: List[Item], **dump_kwargs) -> List[Item]:
+        """Round trip serialized items through the stac_pydantic item model.
+
+        `dump_kwargs` are passed to `model_dump_json`. Items read from the
+        database were validated on ingest, so validation is skipped when the
+        `skip_response_validation` setting is enabled.
+        """
+        item_model = stac_pydantic.Item
+        if Settings.get().skip_response_validation:
+            item_model = stac_pydantic.Item.model_construct
+            # Constructed models keep plain dicts where nested models are
+            # expected, which pydantic warns about when serializing
+            dump_kwargs["warnings"] = False
+        return [
+            json.loads(item_model(**feature).model_dump_json(**dump_kwargs))
+            for feature in features
+        ]
+
+    def _stream_features(
+        self,
+        collection_id: str,
+        bbox: Optional[List[NumType]],
+        datetime: Optional[str],
+        limit: int,
+        base_url: str,
+        record_separator: bytes,
+    ) -> Iterator[bytes]:
+        """Stream the items of a collection as newline terminated GeoJSON features.
+
+        Each feature is prefixed with `record_separator`. Rows are fetched
+        from a server side cursor and serialized in batches, so neither the
+        rows nor the features of the whole response are held in memory. The
+        generator owns its own session since it runs while the response is
+        sent.
+        """
+        with self.session.reader.context_session() as session:
+            query = self._item_collection_query(session, collection_id, bbox, datetime)
+            rows = iter(query.limit(limit).yield_per(STREAM_BATCH_SIZE))
+            while True:
+                batch = list(itertools.islice(rows, STREAM_BATCH_SIZE))
+                if not batch:
+                    break
+                features = self.item_serializer.db_to_stac_batch(
+                    batch, base_url=base_url
+                )
+                yield b"".join(
+                    record_separator + orjson.dumps(feature) + b"\n"
+                    for feature in features
+                )
+
+    def _item_collection_query(
+        self,
+        session: SqlSession,
+        collection_id: str,
+        bbox: Optional[List[NumType]] = None,
+        datetime: Optional[str] = None,
+    ) -> Query:
+        """Build the query for the items of a collection."""
+        query = (
+            session.query(self.item_table)
+            .join(self.collection_table)
+            .filter(self.collection_table.id == collection_id)
+            .order_by(self.item_table.datetime.desc(), self.item_table.id)
+        )
+        # Spatial query
+        geom = None
+        if bbox:
+            bbox = [float(x) for x in bbox]
+            if len(bbox) == 4:
+                geom = ShapelyPolygon.from_bounds(*bbox)
+            elif len(bbox) == 6:
+                """Shapely doesn't support 3d bounding boxes so use the 2d portion"""
+                bbox_2d = [bbox[0], bbox[1], bbox[3], bbox[4]]
+                geom = ShapelyPolygon.from_bounds(*bbox_2d)
+        if geom:
+            # Ensure `geom` is a Shapely geometry
+            if not hasattr(geom, "wkt"):
+                geom = shape(geom)
+
+            # convert to WKT
+            wkt = geom.wkt
+
+            """use shapelys shape method, geoalchemy's shape attribute has been removed"""
+            filter_geom = func.ST_GeomFromText(wkt, 4326)
+            # filter_geom = from_shape(geom, srid=4326)
+            query = query.filter(
+                ga.func.ST_Intersects(self.item_table.geometry, filter_geom)
+            )
+
+        # Temporal query
+        if datetime:
+            # Two tailed query (between)
+            dts = datetime.split("/")
+            # Non-interval date ex. "2000-02-02T00:00:00.00Z"
+            if len(dts) == 1:
+                query = query.filter(self.item_table.datetime == dts[0])
+            # is there a benefit to between instead of >= and <= ?
+            elif dts[0] not in ["", ".."] and dts[1] not in ["", ".."]:
+                query = query.filter(self.item_table.datetime.between(*dts))
+            # All items after the start date
+            elif dts[0] not in ["", ".."]:
+                query = query.filter(self.item_table.datetime >= dts[0])
+            # All items before the end date
+            elif dts[1] not in ["", ".."]:
+                query = query.filter(self.item_table.datetime <= dts[1])
+        return query
+
     def all_collections(self, **kwargs) -> Collections:
         """Read all collections from the database."""
         base_url = str(kwargs["request"].base_url)
@@ -116,56 +236,24 @@ class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
     ) -> ItemCollection:
         """Read an item collection from the database."""
         base_url = str(kwargs["request"].base_url)
+        output_format = kwargs["request"].query_params.get("f")
         with self.session.reader.context_session() as session:
             # Look up the collection first to get a 404 if it doesn't exist
             _ = self._lookup_id(collection_id, self.collection_table, session)
-            query = (
-                session.query(self.item_table)
-                .join(self.collection_table)
-                .filter(self.collection_table.id == collection_id)
-                .order_by(self.item_table.datetime.desc(), self.item_table.id)
-            )
-            # Spatial query
-            geom = None
-            if bbox:
-                bbox = [float(x) for x in bbox]
-                if len(bbox) == 4:
-                    geom = ShapelyPolygon.from_bounds(*bbox)
-                elif len(bbox) == 6:
-                    """Shapely doesn't support 3d bounding boxes so use the 2d portion"""
-                    bbox_2d = [bbox[0], bbox[1], bbox[3], bbox[4]]
-                    geom = ShapelyPolygon.from_bounds(*bbox_2d)
-            if geom:
-                # Ensure `geom` is a Shapely geometry
-                if not hasattr(geom, "wkt"):
-                    geom = shape(geom)
-
-                #convert to WKT
-                wkt = geom.wkt  
-
-                """use shapelys shape method, geoalchemy's shape attribute has been removed""" 
-                filter_geom = func.ST_GeomFromText(wkt, 4326)
-                #filter_geom = from_shape(geom, srid=4326)
-                query = query.filter(
-                    ga.func.ST_Intersects(self.item_table.geometry, filter_geom)
+            if output_format in STREAMING_MEDIA_TYPES:
+                return StreamingResponse(
+                    self._stream_features(
+                        collection_id,
+                        bbox,
+                        datetime,
+                        limit,
+                        base_url,
+                        STREAM_RECORD_SEPARATORS[output_format],
+                    ),
+                    media_type=STREAMING_MEDIA_TYPES[output_format],
                 )
 
-            # Temporal query
-            if datetime:
-                # Two tailed query (between)
-                dts = datetime.split("/")
-                # Non-interval date ex. "2000-02-02T00:00:00.00Z"
-                if len(dts) == 1:
-                    query = query.filter(self.item_table.datetime == dts[0])
-                # is there a benefit to between instead of >= and <= ?
-                elif dts[0] not in ["", ".."] and dts[1] not in ["", ".."]:
-                    query = query.filter(self.item_table.datetime.between(*dts))
-                # All items after the start date
-                elif dts[0] not in ["", ".."]:
-                    query = query.filter(self.item_table.datetime >= dts[0])
-                # All items before the end date
-                elif dts[1] not in ["", ".."]:
-                    query = query.filter(self.item_table.datetime <= dts[1])
+            query = self._item_collection_query(session, collection_id, bbox, datetime)
 
             count = None
             if self.extension_is_enabled("ContextExtension"):
@@ -223,11 +311,9 @@ class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
                     }
                 )
 
-            response_features = []
-            for item in page:
-                response_features.append(
-                    self.item_serializer.db_to_stac(item, base_url=base_url)
-                )
+            response_features = self.item_serializer.db_to_stac_batch(
+                page, base_url=base_url
+            )
 
             context_obj = None
             if self.extension_is_enabled("ContextExtension"):
@@ -509,13 +595,9 @@ class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
                     }
                 )
 
-            response_features = []
-            filter_kwargs = {}
-
-            for item in page:
-                response_features.append(
-                    self.item_serializer.db_to_stac(item, base_url=base_url)
-                )
+            response_features = self.item_serializer.db_to_stac_batch(
+                page, base_url=base_url
+            )
             #for i in response_features:
                 ##print(f'----------------response item(db_to_stac) --------------\n\n{i}')
 
@@ -538,23 +620,18 @@ class CoreCrudClient(PaginationTokenClient, BaseCoreClient):
 
                 # Only pass if non-empty
                 if include and len(include) > 0:
-                    response_features = [
-                        json.loads(stac_pydantic.Item(**feat).model_dump_json(include=include))
-                        for feat in response_features
-                    ]
+                    response_features = self._dump_items(
+                        response_features, include=include
+                    )
                     #print(f'---------------------------------fields extension response included------------------------\n\n{response_features}')
                 elif exclude and len(exclude) > 0:
-                    response_features = [
-                        json.loads(stac_pydantic.Item(**feat).model_dump_json(exclude=exclude))
-                        for feat in response_features
-                    ]
+                    response_features = self._dump_items(
+                        response_features, exclude=exclude
+                    )
                     #print(f'---------------------------------fields extension response excluded------------------------\n\n{response_features}')
 
                 else:
-                    response_features = [
-                        json.loads(stac_pydantic.Item(**feat).model_dump_json())
-                        for feat in response_features
-                    ]
+                    response_features = self._dump_items(response_features)
 
         context_obj = None
         if self.extension_is_enabled("ContextExtension"):
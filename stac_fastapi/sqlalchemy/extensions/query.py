@@ -130,4 +130,4 @@ class QueryExtension(QueryExtensionBase):
     supported fields
     """
 
-    POST = QueryExtensionPostRequest
+    POST = QueryExtensionPostRequest  # type: ignore[assignment]
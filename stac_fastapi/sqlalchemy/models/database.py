@@ -1,36 +1,48 @@
 """SQLAlchemy ORM models."""
 
-import json
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import geoalchemy2 as ga
+import orjson
+import shapely
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
 from stac_fastapi.sqlalchemy.extensions.query import Queryables, QueryableTypes
 
+BaseModel = declarative_base()
 
-from shapely import wkb
-import json
 
-BaseModel = declarative_base()
+@sa.event.listens_for(BaseModel, "instrument_class", propagate=True)
+def _cache_column_names(mapper: sa.orm.Mapper, cls: Any) -> None:
+    """Store the names of the table columns on each mapped class."""
+    cls._column_names = tuple(column.name for column in mapper.local_table.columns)
+
+
+def wkb_to_geojson(value: Any) -> Dict:
+    """Convert a (E)WKB geometry to a GeoJSON geometry dictionary.
+
+    Both the WKB parsing and the GeoJSON encoding are done by GEOS.
+    """
+    return orjson.loads(shapely.to_geojson(shapely.from_wkb(bytes(value))))
+
 
 class GeojsonGeometry(ga.Geometry):
     """Custom geoalchemy type which returns GeoJSON."""
-    
+
     from_text = "ST_GeomFromGeoJSON"
 
     def result_processor(self, dialect: str, coltype):
         """Override default processor to return GeoJSON."""
-        
+
         def process(value: Optional[bytes]):
             if value is not None:
-                # Load directly using shapely
-                geom = wkb.loads(bytes(value))
-                return json.loads(json.dumps(geom.__geo_interface__))
-        
+                return wkb_to_geojson(value)
+
         return process
+
+
 class Collection(BaseModel):  # type:ignore
     """Collection orm model."""
 
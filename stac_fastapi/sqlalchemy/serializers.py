@@ -1,47 +1,135 @@
 """Serializers."""
 import abc
-import json
-from typing import TypedDict
 import datetime
-import attr
+import functools
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, cast
+
 import geoalchemy2 as ga
-from shapely.geometry import shape, box
-from pystac.utils import datetime_to_str
+import orjson
+import shapely
+from shapely.geometry import shape
 from stac_fastapi.types import stac as stac_types
 from stac_fastapi.types.config import Settings
 from stac_fastapi.types.links import CollectionLinks, ItemLinks, resolve_links
 from stac_fastapi.types.rfc3339 import now_to_rfc3339_str, rfc3339_str_to_datetime
 
+from stac_fastapi.sqlalchemy.config import SqlalchemySettings
 from stac_fastapi.sqlalchemy.models import database
 
+# Item columns written by the bulk insert (followed by the indexed fields)
+ITEM_COLUMNS = (
+    "id",
+    "collection_id",
+    "stac_version",
+    "stac_extensions",
+    "geometry",
+    "bbox",
+    "properties",
+    "assets",
+)
+
+
+def datetime_to_str(dt: datetime.datetime) -> str:
+    """Format a datetime as an RFC 3339 string, using `Z` for UTC.
+
+    Naive datetimes are taken to be UTC.
+    """
+    timestamp = dt.isoformat()
+    if dt.tzinfo is None:
+        return timestamp + "Z"
+    if timestamp.endswith("+00:00"):
+        return timestamp[:-6] + "Z"
+    return timestamp
+
+
+def indexed_fields() -> Tuple[Tuple[str, str], ...]:
+    """Get the `(field, attribute name)` pairs of the configured indexed fields.
+
+    Resolve these once per batch of items and pass them down, rather than
+    once per item.
+    """
+    settings = cast(SqlalchemySettings, Settings.get())
+    return tuple((field, field.split(":")[-1]) for field in settings.indexed_fields)
+
+
+@functools.lru_cache(maxsize=1024)
+def _item_links_template(
+    base_url: str, collection_id: str
+) -> Tuple[Tuple[Dict[str, Any], ...], int, str]:
+    """Build the links shared by all items of a collection.
+
+    Returns the links, the index of the `self` link and the href prefix the
+    item id is appended to.
+    """
+    links = ItemLinks(
+        collection_id=collection_id, item_id="", base_url=base_url
+    ).create_links()
+    self_index = next(i for i, link in enumerate(links) if link["rel"] == "self")
+    return tuple(links), self_index, links[self_index]["href"]
+
+
+def item_links(base_url: str, collection_id: str, item_id: str) -> List[Dict]:
+    """Create the links of an item from the cached collection template."""
+    template, self_index, self_href = _item_links_template(base_url, collection_id)
+    links = [dict(link) for link in template]
+    links[self_index]["href"] = self_href + item_id
+    return links
+
+
+@functools.lru_cache(maxsize=1024)
+def _collection_links_template(
+    base_url: str, collection_id: str
+) -> Tuple[Dict[str, Any], ...]:
+    """Build the links of a collection."""
+    return tuple(
+        CollectionLinks(collection_id=collection_id, base_url=base_url).create_links()
+    )
+
+
+def collection_links(base_url: str, collection_id: str) -> List[Dict]:
+    """Create the links of a collection from the cached template."""
+    template = _collection_links_template(base_url, collection_id)
+    return [dict(link) for link in template]
+
 
-@attr.s  # type:ignore
 class Serializer(abc.ABC):
     """Defines serialization methods between the API and the data model."""
 
     @classmethod
     @abc.abstractmethod
-    def db_to_stac(cls, db_model: database.BaseModel, base_url: str) -> TypedDict:
+    def db_to_stac(
+        cls, db_model: database.BaseModel, base_url: str
+    ) -> Mapping[str, Any]:
         """Transform database model to stac."""
         ...
 
     @classmethod
     @abc.abstractmethod
     def stac_to_db(
-        cls, stac_data: TypedDict, exclude_geometry: bool = False
+        cls, stac_data: Any, exclude_geometry: bool = False
     ) -> database.BaseModel:
         """Transform stac to database model."""
         ...
 
     @classmethod
-    def row_to_dict(cls, db_model: database.BaseModel):
+    def db_to_stac_batch(
+        cls, db_models: Sequence[database.BaseModel], base_url: str
+    ) -> Sequence[Mapping[str, Any]]:
+        """Transform a sequence of database models to stac."""
+        return [cls.db_to_stac(db_model, base_url) for db_model in db_models]
+
+    @classmethod
+    def row_to_dict(cls, db_model: database.BaseModel) -> Dict[str, Any]:
         """Transform a database model to it's dictionary representation."""
-        d = {}
-        for column in db_model.__table__.columns:
-            value = getattr(db_model, column.name)
-            if value:
-                d[column.name] = value
-        return d
+        # Loaded attributes live in the instance __dict__, reading them from
+        # there skips the instrumented attribute descriptors
+        state = db_model.__dict__
+        return {
+            name: value
+            for name in type(db_model)._column_names
+            if (value := state[name] if name in state else getattr(db_model, name))
+        }
+
 
 class ItemSerializer(Serializer):
     """Serialization methods for STAC items."""
@@ -49,109 +137,178 @@ class ItemSerializer(Serializer):
     @classmethod
     def db_to_stac(cls, db_model: database.Item, base_url: str) -> stac_types.Item:
         """Transform database model to stac item."""
-        properties = db_model.properties.copy()
-        indexed_fields = Settings.get().indexed_fields
-        for field in indexed_fields:
-            # Use getattr to accommodate extension namespaces
-            field_value = getattr(db_model, field.split(":")[-1])
-            if field == "datetime":
-                field_value = datetime_to_str(field_value)
-            properties[field] = field_value
-        item_id = db_model.id
-        collection_id = db_model.collection_id
-        item_links = ItemLinks(
-            collection_id=collection_id, item_id=item_id, base_url=base_url
-        ).create_links()
+        geometry = cls._geometry(db_model)
 
-        db_links = db_model.links
-        if db_links:
-            item_links += resolve_links(db_links, base_url)
+        # The bbox column is NUMERIC[] and comes back as Decimals, but
+        # freshly built models may already hold floats
+        bbox = db_model.bbox
+        if bbox and not isinstance(bbox[0], float):
+            bbox = list(map(float, bbox))
 
-        stac_extensions = db_model.stac_extensions or []
+        # get bbox from geom
+        if geometry is not None:
+            bbox = list(shape(geometry).bounds)
 
+        return cls._to_stac(db_model, base_url, geometry, bbox, indexed_fields())
+
+    @classmethod
+    def db_to_stac_batch(
+        cls, db_models: Sequence[database.Item], base_url: str
+    ) -> List[stac_types.Item]:
+        """Transform a page of database models to stac items.
+
+        The geometries of the whole page are parsed and their bounding boxes
+        computed with single vectorized shapely calls, rather than building
+        a shapely geometry per item in python.
+        """
+        geometries = [cls._geometry(db_model) for db_model in db_models]
+        bboxes: List[Optional[List[float]]] = [None] * len(db_models)
+        with_geometry = []
+        for i, (db_model, geometry) in enumerate(zip(db_models, geometries)):
+            if geometry is not None:
+                with_geometry.append(i)
+                continue
+            # Only rows without a geometry keep their stored bbox
+            bbox = db_model.bbox
+            if bbox and not isinstance(bbox[0], float):
+                bbox = list(map(float, bbox))
+            bboxes[i] = bbox
+
+        if with_geometry:
+            geoms = shapely.from_geojson(
+                [orjson.dumps(geometries[i]) for i in with_geometry]
+            )
+            for i, bounds in zip(with_geometry, shapely.bounds(geoms).tolist()):
+                bboxes[i] = bounds
+
+        fields = indexed_fields()
+        return [
+            cls._to_stac(db_model, base_url, geometry, bbox, fields)
+            for db_model, geometry, bbox in zip(db_models, geometries, bboxes)
+        ]
+
+    @staticmethod
+    def _geometry(db_model: database.Item) -> Optional[Dict[str, Any]]:
+        """Get the geometry of a database model as a GeoJSON dictionary."""
         # The custom geometry we are using emits geojson if the geometry is bound to the database
         # Otherwise it will return a geoalchemy2 WKBElement
         # TODO: It's probably best to just remove the custom geometry type
         geometry = db_model.geometry
         if isinstance(geometry, ga.elements.WKBElement):
-            geometry = shape(geometry).__geo_interface__
+            geometry = database.wkb_to_geojson(geometry.data)
         if isinstance(geometry, str):
-            geometry = json.loads(geometry)
-    
-        bbox = db_model.bbox
-        if bbox is not None:
-            bbox = [float(x) for x in db_model.bbox]
-
-        #get bbox from geom
-        if geometry is None:
-            geom = None
-        else:
-            geom = shape(geometry)
-            bbox = list(geom.bounds)
-
-        item = stac_types.Item(
-            type="Feature",
-            stac_version=db_model.stac_version,
-            stac_extensions=stac_extensions,
-            id=db_model.id,
-            collection=db_model.collection_id,
-            geometry=geometry,
-            bbox=bbox,
-            properties=properties,
-            links=item_links,
-            assets=db_model.assets,
-        )
+            geometry = orjson.loads(geometry)
+        return geometry
+
+    @classmethod
+    def _to_stac(
+        cls,
+        db_model: database.Item,
+        base_url: str,
+        geometry: Optional[Dict[str, Any]],
+        bbox: Optional[List[float]],
+        fields: Tuple[Tuple[str, str], ...],
+    ) -> stac_types.Item:
+        """Build the stac item from a database model and its parsed geometry.
+
+        `fields` are the pairs returned by `indexed_fields`.
+        """
+        # Use getattr to accommodate extension namespaces
+        indexed_values = {
+            field: getattr(db_model, attr_name) for field, attr_name in fields
+        }
+        if "datetime" in indexed_values:
+            indexed_values["datetime"] = datetime_to_str(indexed_values["datetime"])
+        properties = {**db_model.properties, **indexed_values}
+        links = item_links(base_url, db_model.collection_id, db_model.id)
+
+        db_links = db_model.links
+        if db_links:
+            links += resolve_links(db_links, base_url)
 
-        #print(f'id: {item['id']}: {type(item)}')
+        stac_extensions = db_model.stac_extensions or []
 
-        return item
+        # stac_types.Item is a TypedDict, a dict literal builds the same
+        # object without the keyword argument call
+        return cast(
+            stac_types.Item,
+            {
+                "type": "Feature",
+                "stac_version": db_model.stac_version,
+                "stac_extensions": stac_extensions,
+                "id": db_model.id,
+                "collection": db_model.collection_id,
+                "geometry": geometry,
+                "bbox": bbox,
+                "properties": properties,
+                "links": links,
+                "assets": db_model.assets,
+            },
+        )
 
     @classmethod
     def stac_to_db(
-        cls, stac_data: TypedDict, exclude_geometry: bool = False
+        cls, stac_data: Any, exclude_geometry: bool = False
     ) -> database.Item:
         """Transform stac item to database model."""
-        #bulk items endpoint brings in a dictionarty, while the items endpoint brings in a pystac Item object
-        #we work with dictionaries.... easy to manipulate
-        if type(stac_data) is not dict:
+        return database.Item(**cls.stac_to_db_row(stac_data))
+
+    @classmethod
+    def db_columns(
+        cls, fields: Optional[Tuple[Tuple[str, str], ...]] = None
+    ) -> Tuple[str, ...]:
+        """Names of the columns written by the bulk insert, in order."""
+        if fields is None:
+            fields = indexed_fields()
+        return ITEM_COLUMNS + tuple(attr_name for _, attr_name in fields)
+
+    @classmethod
+    def stac_to_db_row(
+        cls,
+        stac_data: Any,
+        fields: Optional[Tuple[Tuple[str, str], ...]] = None,
+    ) -> Dict[str, Any]:
+        """Transform stac item to a dictionary of database column values.
+
+        Unlike `stac_to_db` this does not build an ORM instance, so the rows
+        can be handed straight to a core `INSERT` during bulk ingest. The
+        geometry is returned as a GeoJSON string. Pass the `indexed_fields`
+        when transforming a batch of items so they are only resolved once.
+        """
+        # bulk items endpoint brings in a dictionarty, while the items endpoint brings in a pystac Item object
+        # we work with dictionaries.... easy to manipulate
+        if not isinstance(stac_data, dict):
             stac_data = stac_data.to_dict()
 
-        indexed_fields = {}
-        for field in Settings.get().indexed_fields:
-            # Use getattr to accommodate extension namespaces
+        if fields is None:
+            fields = indexed_fields()
+
+        indexed_values = {}
+        for field, attr_name in fields:
             field_value = stac_data["properties"][field]
             if field == "datetime" and isinstance(field_value, str):
                 field_value = rfc3339_str_to_datetime(field_value)
-            indexed_fields[field.split(":")[-1]] = field_value
+            indexed_values[attr_name] = field_value
 
-            # TODO: Exclude indexed fields from the properties jsonb field to prevent duplication
+        # TODO: Exclude indexed fields from the properties jsonb field to prevent duplication
 
-            now = now_to_rfc3339_str()
-            if "created" not in stac_data["properties"]:
-                stac_data["properties"]["created"] = now
-            stac_data["properties"]["updated"] = now
+        now = now_to_rfc3339_str()
+        if "created" not in stac_data["properties"]:
+            stac_data["properties"]["created"] = now
+        stac_data["properties"]["updated"] = now
 
         geometry = stac_data["geometry"]
         if geometry is not None:
-            geometry = json.dumps(geometry)
-
-        #make the datetime objects json serializable
-        properties = stac_data['properties']
-        dt = properties['datetime']
-        if  type(dt) == datetime.datetime:
-            properties['datetime'] = dt.isoformat()
-        
-        cr = properties['created']
-        if type(cr) == datetime.datetime:
-            properties['created'] = cr.isoformat()
-
-        stac_extensions = stac_data['stac_extensions']
+            geometry = orjson.dumps(geometry).decode()
+
+        # Datetimes left in the properties are encoded by the engine's orjson
+        # serializer when the JSONB column is written
+        properties = stac_data["properties"]
+
+        stac_extensions = stac_data["stac_extensions"]
         extensions = [str(ext) for ext in stac_extensions] if stac_extensions else []
-        
-        #print(stac_data)
-        
 
-        return database.Item(
+        return dict(
             id=stac_data["id"],
             collection_id=stac_data["collection"],
             stac_version=stac_data["stac_version"],
@@ -160,33 +317,33 @@ class ItemSerializer(Serializer):
             bbox=stac_data.get("bbox"),
             properties=properties,
             assets=stac_data["assets"],
-            **indexed_fields,
+            **indexed_values,
         )
 
-        
+
 class CollectionSerializer(Serializer):
     """Serialization methods for STAC collections."""
 
     @classmethod
-    def db_to_stac(cls, db_model: database.Collection, base_url: str) -> TypedDict:
+    def db_to_stac(
+        cls, db_model: database.Collection, base_url: str
+    ) -> stac_types.Collection:
         """Transform database model to stac collection."""
-        collection_links = CollectionLinks(
-            collection_id=db_model.id, base_url=base_url
-        ).create_links()
+        links = collection_links(base_url, db_model.id)
 
         db_links = db_model.links
         if db_links:
-            collection_links += resolve_links(db_links, base_url)
-
-        collection = stac_types.Collection(
-            type="Collection",
-            id=db_model.id,
-            stac_version=db_model.stac_version,
-            description=db_model.description,
-            license=db_model.license,
-            extent=db_model.extent,
-            links=collection_links,
-        )
+            links += resolve_links(db_links, base_url)
+
+        collection: Dict[str, Any] = {
+            "type": "Collection",
+            "id": db_model.id,
+            "stac_version": db_model.stac_version,
+            "description": db_model.description,
+            "license": db_model.license,
+            "extent": db_model.extent,
+            "links": links,
+        }
         # We need to manually include optional values to ensure they are
         # excluded if we're not using response models.
         if db_model.stac_extensions:
@@ -199,97 +356,27 @@ class CollectionSerializer(Serializer):
             collection["providers"] = db_model.providers
         if db_model.summaries:
             collection["summaries"] = db_model.summaries
-        return collection
+        return cast(stac_types.Collection, collection)
+
     @classmethod
-    def stac_to_db(cls, stac_data: TypedDict, exclude_geometry: bool = False) -> database.Collection:
+    def stac_to_db(
+        cls, stac_data: Any, exclude_geometry: bool = False
+    ) -> database.Collection:
         """Transform STAC collection to database model."""
-        #handle Extent with datetime conversion
-        if type(stac_data) is not dict:
+        # Pydantic models are dumped in one pass, which also turns datetimes,
+        # urls and nested models (providers, links, ...) into JSON types
+        if hasattr(stac_data, "model_dump"):
+            stac_data = stac_data.model_dump(
+                mode="json", by_alias=True, exclude_none=True
+            )
+        elif not isinstance(stac_data, dict):
             stac_data = stac_data.to_dict()
-        
-        extent = stac_data['extent']
-        extent_dict = {
-            "spatial": {"bbox": extent['spatial']['bbox']},
-        }
-        
-        #convert temporal intervals (handles nested datetime objects)
-        temporal_intervals = []
-        for interval in extent['temporal']['interval']:
-            if interval:  # Check if interval exists
-                serialized_interval = []
-                for dt in interval:
-                    #convert datetime to ISO string if exists
-                    serialized_interval.append(
-                        dt.isoformat() if isinstance(dt, datetime.datetime) else dt
-                    )
-                temporal_intervals.append(serialized_interval)
-        
-        extent_dict["temporal"] = {"interval": temporal_intervals}
-        # stac_data = stac_data.to_dict()
-        # stac_data.update({"extent": extent_dict,})
-        
-        
-        #transform providers into JSON-serializable dicts
-        providers = stac_data['providers']
-        # print(f"Providers: {providers}, type: {type(providers)}")
-        # lis=[Provider.to_dict() for Provider in providers]
-        #print(lis)
-        """
-        #transform range into JSON-serializable dicts
-        summaries = stac_data.summaries]
-        summaries_serialized = {
-            key: value.to_dict() if hasattr(value, "to_dict") else value
-            for key, value in summaries.items()
-        }
-        #print(f"Summaries serialized: {summaries_serialized}")
-        """
-
+        stac_data = dict(stac_data)
+        stac_data.pop("assets", None)
 
-        '''
-        #transform links into JSON-serializable dicts
-        links=stac_data.links.root
-        print(f'-----------------------------------------------------{links}, type: {type(links)}')
-        #links is of type list of dictionaries.
-        #convert the Links object to a JSON serializable list of dictionaries
-        links_dict = [
-            {
-                "href": link.href,
-                "rel": link.rel,
-                "type": link.type,
-                "title":link.title,
-            }
-            for link in links
-        ]
-        #print(f'Linkssss: {links_dict}')
-
-        '''
-
-        stac_extensions = stac_data.get('stac_extensions', [])
-        #update stac_extensions this came from make tests
-        #stac_extensions = stac_data['stac_extensions']
-        extensions = [str(ext) for ext in stac_extensions] if stac_extensions else []
+        stac_extensions = stac_data.get("stac_extensions")
+        stac_data["stac_extensions"] = (
+            [str(ext) for ext in stac_extensions] if stac_extensions else []
+        )
 
-        #add the serialised dict to a dict
-        #stac_data=dict(stac_data)
-
-        #print(f"Stac data before update: {stac_data}")
-
-        stac_data.update({
-            "stac_extensions": extensions,
-            "providers": providers,
-            "extent": extent_dict,
-            "links": stac_data['links'],
-            "summaries": stac_data['summaries'],
-        })
-        
-        #print(json.dumps(stac_data, indent=4))
-        #print(stac_data)
-        stac_data.pop('assets', None)  
-
-        #verify serialization works
-        try:
-            json.dumps(stac_data, indent=4)
-        except TypeError as e:
-            print(f"Serialization error: {e}")
-        
-        return database.Collection(**dict(stac_data))
\ No newline at end of file
+        return database.Collection(**stac_data)
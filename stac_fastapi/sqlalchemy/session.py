@@ -2,9 +2,10 @@
 import logging
 import os
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Iterator
 
 import attr
+import orjson
 import psycopg2
 import sqlalchemy as sa
 from fastapi_utils.session import FastAPISessionMaker as _FastAPISessionMaker
@@ -16,9 +17,23 @@ from stac_fastapi.sqlalchemy.config import SqlalchemySettings
 logger = logging.getLogger(__name__)
 
 
+def json_serializer(obj: Any) -> str:
+    """Serialize JSON columns with orjson, which encodes datetimes natively."""
+    return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z).decode()
+
+
 class FastAPISessionMaker(_FastAPISessionMaker):
     """FastAPISessionMaker."""
 
+    def get_new_engine(self) -> sa.engine.Engine:
+        """Override base method to (de)serialize JSON columns with orjson."""
+        return sa.create_engine(
+            self.database_uri,
+            pool_pre_ping=True,
+            json_serializer=json_serializer,
+            json_deserializer=orjson.loads,
+        )
+
     @contextmanager
     def context_session(self) -> Iterator[SqlSession]:
         """Override base method to include exception handling."""
@@ -1,7 +1,7 @@
 """transactions extension client."""
 
 import logging
-from typing import Optional, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import attr
 from fastapi import HTTPException
@@ -17,7 +17,7 @@ from starlette.responses import Response
 
 from stac_fastapi.sqlalchemy import serializers
 from stac_fastapi.sqlalchemy.models import database
-from stac_fastapi.sqlalchemy.session import Session
+from stac_fastapi.sqlalchemy.session import Session, json_serializer
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +44,7 @@ class TransactionsClient(BaseTransactionsClient):
     ) -> Optional[stac_types.Item]:
         """Create item."""
         base_url = str(kwargs["request"].base_url)
-        if type(item) != dict:
+        if not isinstance(item, dict):
             item = item.to_dict()
         # If a feature collection is posted
         if item["type"] == "FeatureCollection":
@@ -78,7 +78,7 @@ class TransactionsClient(BaseTransactionsClient):
     def update_item(
         self, collection_id: str, item_id: str, item: stac_types.Item, **kwargs
     ) -> Optional[Union[stac_types.Item, Response]]:
-        if type(item) != dict:
+        if not isinstance(item, dict):
             item = item.to_dict()
         """Update item."""
         body_collection_id = item.get("collection")
@@ -115,7 +115,7 @@ class TransactionsClient(BaseTransactionsClient):
         self, collection: stac_types.Collection, **kwargs
     ) -> Optional[Union[stac_types.Collection, Response]]:
         """Update collection."""
-        if type(collection) != dict:
+        if not isinstance(collection, dict):
             collection = collection.to_dict()
         base_url = str(kwargs["request"].base_url)
         with self.session.reader.context_session() as session:
@@ -187,28 +187,68 @@ class BulkTransactionsClient(BaseBulkTransactionsClient):
         """Create sqlalchemy engine."""
         self.engine = self.session.writer.cached_engine
 
-    def _preprocess_item(self, item: stac_types.Item) -> stac_types.Item:
+    def _preprocess_item(
+        self, item: stac_types.Item, fields: Tuple[Tuple[str, str], ...]
+    ) -> Dict[str, Any]:
         """Preprocess items to match data model.
 
         # TODO: dedup with GetterDict logic (ref #58)
         """
-        db_model = self.item_serializer.stac_to_db(item)
-        return self.item_serializer.row_to_dict(db_model)
+        return self.item_serializer.stac_to_db_row(item, fields)
+
+    def _insert_rows(
+        self, rows: List[Dict[str, Any]], fields: Tuple[Tuple[str, str], ...]
+    ) -> List[str]:
+        """Insert item rows sent to the database as a single JSON array.
+
+        The array is expanded server side with `jsonb_populate_record`, so a
+        whole batch is one parameter and one round trip. The geometry is
+        parsed from its GeoJSON string by the database. Returns the ids of
+        the inserted items.
+        """
+        columns = self.item_serializer.db_columns(fields)
+        table = self.item_table.__table__.fullname
+        query = (
+            "INSERT INTO {table} ({columns}) SELECT {values} "
+            "FROM jsonb_array_elements(%s::jsonb) AS e, "
+            "LATERAL jsonb_populate_record(NULL::{table}, e - 'geometry') AS r "
+            "RETURNING id"
+        ).format(
+            table=table,
+            columns=", ".join(f'"{column}"' for column in columns),
+            values=", ".join(
+                "ST_SetSRID(ST_GeomFromGeoJSON(e->>'geometry'), 4326)"
+                if column == "geometry"
+                else f'r."{column}"'
+                for column in columns
+            ),
+        )
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query, (json_serializer(rows),))
+                ids = [row[0] for row in cursor.fetchall()]
+            conn.commit()
+        finally:
+            conn.close()
+        return ids
 
     def bulk_item_insert(
         self, items: Items, chunk_size: Optional[int] = None, **kwargs
     ) -> str:
-        """Bulk item insertion using sqlalchemy core.
+        """Bulk item insertion with `INSERT ... SELECT` from a JSON payload.
 
         https://docs.sqlalchemy.org/en/13/faq/performance.html#i-m-inserting-400-000-rows-with-the-orm-and-it-s-really-slow
         """
         # Use items.items because schemas.Items is a model with an items key
-        processed_items = [self._preprocess_item(item) for item in items]
-        return_msg = f"Successfully added {len(processed_items)} items."
-        if chunk_size:
-            for chunk in self._chunks(processed_items, chunk_size):
-                self.engine.execute(self.item_table.__table__.insert(), chunk)
-            return return_msg
-
-        self.engine.execute(self.item_table.__table__.insert(), processed_items)
-        return return_msg
+        fields = serializers.indexed_fields()
+        processed_items = [self._preprocess_item(item, fields) for item in items]
+        chunks = (
+            self._chunks(processed_items, chunk_size)
+            if chunk_size
+            else [processed_items]
+        )
+        inserted_ids = []
+        for chunk in chunks:
+            inserted_ids.extend(self._insert_rows(chunk, fields))
+        return f"Successfully added {len(inserted_ids)} items."
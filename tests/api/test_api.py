@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from urllib.parse import quote_plus
 
 import orjson
+from stac_fastapi.types.config import Settings
 
 from ..conftest import MockStarletteRequest
 
@@ -393,6 +394,24 @@ def test_app_fields_extension_return_all_properties(
             assert feature["properties"][expected_prop] == expected_value
 
 
+def test_app_fields_extension_skip_response_validation(
+    load_test_data, app_client, postgres_transactions, monkeypatch
+):
+    monkeypatch.setattr(Settings.get(), "skip_response_validation", True)
+    item = load_test_data("test_item.json")
+    postgres_transactions.create_item(
+        item["collection"], item, request=MockStarletteRequest
+    )
+
+    resp = app_client.get(
+        "/search", params={"collections": ["test-collection"], "fields": "properties"}
+    )
+    assert resp.status_code == 200
+    feature = resp.json()["features"][0]
+    assert "links" not in feature
+    assert feature["properties"]["gsd"] == item["properties"]["gsd"]
+
+
 def test_landing_forwarded_header(load_test_data, app_client, postgres_transactions):
     item = load_test_data("test_item.json")
     postgres_transactions.create_item(
@@ -300,6 +300,8 @@ def test_bulk_item_insert(
 
     fc = postgres_core.item_collection(coll["id"], request=MockStarletteRequest)
     assert len(fc["features"]) == 10
+    for feat in fc["features"]:
+        assert feat["geometry"] == item["geometry"]
 
     for item in items.values():
         postgres_transactions.delete_item(
@@ -323,7 +325,8 @@ def test_bulk_item_insert_chunked(
         _item["id"] = str(uuid.uuid4())
         items.append(_item)
 
-    postgres_bulk_transactions.bulk_item_insert(items=items, chunk_size=2)
+    resp = postgres_bulk_transactions.bulk_item_insert(items=items, chunk_size=2)
+    assert resp == "Successfully added 10 items."
 
     for item in items:
         postgres_transactions.delete_item(
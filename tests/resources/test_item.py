@@ -329,6 +329,43 @@ def test_get_item_collection(app_client, load_test_data):
     assert len(item_collection["features"]) == len(range(item_count))
 
 
+def test_get_item_collection_geojsonseq(app_client, load_test_data):
+    """Test streaming an item collection as a GeoJSON text sequence (core)"""
+    item_count = randint(1, 4)
+    test_item = load_test_data("test_item.json")
+
+    for idx in range(item_count):
+        _test_item = deepcopy(test_item)
+        _test_item["id"] = test_item["id"] + str(idx)
+        resp = app_client.post(
+            f"/collections/{test_item['collection']}/items", json=_test_item
+        )
+        assert resp.status_code == 201
+
+    resp = app_client.get(
+        f"/collections/{test_item['collection']}/items", params={"f": "geojsonseq"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/geo+json-seq"
+
+    # RFC 8142: every record is an RS byte, a JSON text and a line feed
+    records = resp.content.split(b"\n")
+    assert records.pop() == b""
+    assert len(records) == item_count
+    assert all(record.startswith(b"\x1e") for record in records)
+    features = [json.loads(record[1:]) for record in records]
+    assert all(feat["type"] == "Feature" for feat in features)
+
+    resp = app_client.get(
+        f"/collections/{test_item['collection']}/items", params={"f": "ndjson"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/ndjson"
+    records = resp.content.splitlines()
+    assert len(records) == item_count
+    assert all(json.loads(record)["type"] == "Feature" for record in records)
+
+
 def test_pagination(app_client, load_test_data):
     """Test item collection pagination (paging extension)"""
     item_count = 10